@@ -1,4 +1,5 @@
 from dataclasses import dataclass
+from typing import Literal
 
 @dataclass
 class ProcessingConfig:
@@ -9,3 +10,10 @@ class ProcessingConfig:
     extract_images: bool = True
     extract_text_by_page: bool = True
     generate_hash: bool = True
+    text_backend: Literal["pdfplumber", "pypdfium2"] = "pypdfium2"
+    compact_json: bool = False
+    x_tolerance: float = 3
+    y_tolerance: float = 3
+    layout: bool = False
+    image_backend: Literal["pdfplumber", "pypdfium2"] = "pdfplumber"
+    max_workers: int | None = None
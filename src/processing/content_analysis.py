@@ -1,13 +1,67 @@
 import pdfplumber
+import pypdfium2 as pdfium
+import pypdfium2.raw as pdfium_c
 import logging
 from pathlib import Path
+import contextlib
+import copy
 import hashlib
+from functools import lru_cache
+from src.config.processing_config import ProcessingConfig
 
-def analyze_page_content(pdf_path: Path) -> dict:
+
+@contextlib.contextmanager
+def open_pdf(pdf_or_path: Path | pdfplumber.PDF):
     """
-    Analyze PDF pages to detect text vs. image/scanned content.
-    Returns dictionary with page-by-page analysis and summary counts.
+    Open a PDF once so it can be shared by the analysis functions below, e.g.
+
+        with open_pdf(path) as pdf:
+            content = analyze_page_content(pdf)
+            images = extract_image_metadata(pdf)
+
+    Pages parsed by one function stay cached on the open PDF for the next.
+    An already-open pdfplumber.PDF is passed through and left open.
     """
+    if isinstance(pdf_or_path, pdfplumber.PDF):
+        yield pdf_or_path
+    else:
+        with pdfplumber.open(pdf_or_path) as pdf:
+            yield pdf
+
+
+def _pdf_name(pdf_or_path: Path | pdfplumber.PDF) -> str:
+    """
+    File name of a PDF path or open pdfplumber.PDF, for log messages.
+    """
+    if isinstance(pdf_or_path, pdfplumber.PDF):
+        return Path(pdf_or_path.path).name if pdf_or_path.path else "<stream>"
+    return Path(pdf_or_path).name
+
+
+def text_extraction_kwargs(config: ProcessingConfig) -> dict:
+    """
+    Keyword arguments for pdfplumber's page.extract_text(), taken from the config.
+    The config defaults match pdfplumber's own (no layout analysis, 3pt tolerances);
+    tune them per corpus.
+    """
+    return {
+        "x_tolerance": config.x_tolerance,
+        "y_tolerance": config.y_tolerance,
+        "layout": config.layout
+    }
+
+
+def analyze_pdf(pdf_or_path: Path | pdfplumber.PDF,
+                config: ProcessingConfig = ProcessingConfig()) -> dict:
+    """
+    Run page content analysis, image metadata extraction and page-wise text
+    extraction in a single pass, opening and parsing the PDF only once. Prefer
+    this over the per-analysis wrappers below when more than one is needed.
+    Accepts a path or an already-open pdfplumber.PDF (see open_pdf()).
+    Returns dictionary with "content", "images" and "pages_text" results, and
+    "complete", which is False if reading the PDF failed part-way.
+    """
+    text_kwargs = text_extraction_kwargs(config)
     content_analysis = {
         "total_pages": 0,
         "text_pages": 0,
@@ -15,12 +69,24 @@ def analyze_page_content(pdf_path: Path) -> dict:
         "mixed_pages": 0,
         "page_details": []
     }
+    page_details = []
+    image_metadata = []
+    pages_text = []
+    pages_done = 0
+    complete = False
 
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            content_analysis["total_pages"] = len(pdf.pages)
+        with open_pdf(pdf_or_path) as pdf:
+            page_count = len(pdf.pages)
+            content_analysis["total_pages"] = page_count
+            # Per-page results are sized up front and filled by index
+            page_details = [None] * page_count
+            pages_text = [None] * page_count
 
             for i, page in enumerate(pdf.pages):
+                text = page.extract_text(**text_kwargs) or ""
+                images = page.images
+
                 page_info = {
                     "page_number": i + 1,
                     "has_text": False,
@@ -29,14 +95,13 @@ def analyze_page_content(pdf_path: Path) -> dict:
                     "image_count": 0
                 }
 
-                text = page.extract_text() or ""
                 if text.strip():
                     page_info["has_text"] = True
                     page_info["text_length"] = len(text)
 
-                if page.images:
+                if images:
                     page_info["has_images"] = True
-                    page_info["image_count"] = len(page.images)
+                    page_info["image_count"] = len(images)
 
                 if page_info["has_text"] and page_info["has_images"]:
                     content_analysis["mixed_pages"] += 1
@@ -45,69 +110,221 @@ def analyze_page_content(pdf_path: Path) -> dict:
                 elif page_info["has_images"]:
                     content_analysis["image_pages"] += 1
 
-                content_analysis["page_details"].append(page_info)
+                page_details[i] = page_info
+
+                for img in images:
+                    image_metadata.append({
+                        "page_number": i + 1,
+                        "x0": img["x0"],
+                        "y0": img["y0"],
+                        "x1": img["x1"],
+                        "y1": img["y1"],
+                        "width": img["width"],
+                        "height": img["height"],
+                        "name": img.get("name", ""),
+                        "imagetype": img.get("imagetype", "")
+                    })
+
+                pages_text[i] = {
+                    "page_number": i + 1,
+                    "text": text,
+                    "word_count": len(text.split()),
+                    "has_images": len(images) > 0
+                }
+                pages_done = i + 1
+        complete = True
 
     except Exception as e:
-        logging.error(f"Error analyzing {pdf_path.name}: {e}")
+        logging.error(f"Error analyzing {_pdf_name(pdf_or_path)}: {e}")
+        # Keep the pages analyzed before the failure, drop the unfilled slots
+        del page_details[pages_done:]
+        del pages_text[pages_done:]
 
-    return content_analysis
+    content_analysis["page_details"] = page_details
+
+    return {
+        "content": content_analysis,
+        "images": image_metadata,
+        "pages_text": pages_text,
+        "complete": complete
+    }
 
 
-def extract_image_metadata(pdf_path: Path) -> list[dict]:
+class _IncompleteAnalysis(Exception):
     """
-    Extract metadata about embedded images.
-    Returns list of image information dictionaries.
+    Carries an analysis that failed part-way out of _analyze_pdf_cached(), so
+    lru_cache doesn't memoize it and the next call reads the file again.
+    """
+    def __init__(self, result: dict):
+        super().__init__()
+        self.result = result
+
+
+@lru_cache(maxsize=4)
+def _analyze_pdf_cached(pdf_path_str: str, mtime_ns: int, size: int,
+                        x_tolerance: float, y_tolerance: float, layout: bool) -> dict:
+    """
+    Memoized analyze_pdf(), keyed on path, modification time and size so an
+    edited file is parsed again even where the filesystem's mtime resolution is
+    coarse. The cached result is shared; callers must copy it.
+    """
+    config = ProcessingConfig(x_tolerance=x_tolerance, y_tolerance=y_tolerance,
+                              layout=layout)
+    result = analyze_pdf(Path(pdf_path_str), config)
+    if not result["complete"]:
+        raise _IncompleteAnalysis(result)
+    return result
+
+
+def _cached_analysis_part(pdf_or_path: Path | pdfplumber.PDF, part: str,
+                          config: ProcessingConfig):
+    """
+    Return a private copy of one part of the memoized analysis of a PDF path,
+    so calling several of the wrappers below in a row parses the PDF only once.
+    An open pdfplumber.PDF is analyzed directly; its pages cache the parse.
+    """
+    if isinstance(pdf_or_path, pdfplumber.PDF):
+        return analyze_pdf(pdf_or_path, config)[part]
+
+    pdf_path = Path(pdf_or_path)
+    try:
+        stat = pdf_path.stat()
+    except OSError:
+        # Let analyze_pdf log the error and return its empty results
+        return analyze_pdf(pdf_path, config)[part]
+    try:
+        result = _analyze_pdf_cached(str(pdf_path), stat.st_mtime_ns, stat.st_size,
+                                     **text_extraction_kwargs(config))
+    except _IncompleteAnalysis as e:
+        # Not memoized; the result is private to this call, so no copy is needed
+        return e.result[part]
+    return copy.deepcopy(result[part])
+
+
+def analyze_page_content(pdf_or_path: Path | pdfplumber.PDF,
+                         config: ProcessingConfig = ProcessingConfig()) -> dict:
+    """
+    Analyze PDF pages to detect text vs. image/scanned content.
+    Returns dictionary with page-by-page analysis and summary counts.
+    """
+    return _cached_analysis_part(pdf_or_path, "content", config)
+
+
+def _to_pdfplumber_bbox(bbox: tuple, mediabox: tuple, rotation: int) -> tuple:
+    """
+    Map a bounding box from PDF user space (what PDFium reports) to pdfplumber's
+    x0/y0/x1/y1. pdfminer rotates by the page's /Rotate and moves the MediaBox
+    origin to (0, 0); pdfplumber then adds the left edge of the (rotated)
+    MediaBox back onto x.
+    """
+    x0, y0, x1, y1 = bbox
+    mx0, my0, mx1, my1 = mediabox
+    if rotation == 90:
+        xs, ys = (y0 - my0, y1 - my0), (mx1 - x0, mx1 - x1)
+        x_shift = min(my0, my1)
+    elif rotation == 180:
+        xs, ys = (mx1 - x0, mx1 - x1), (my1 - y0, my1 - y1)
+        x_shift = min(mx0, mx1)
+    elif rotation == 270:
+        xs, ys = (my1 - y0, my1 - y1), (x0 - mx0, x1 - mx0)
+        x_shift = min(my0, my1)
+    else:
+        xs, ys = (x0 - mx0, x1 - mx0), (y0 - my0, y1 - my0)
+        x_shift = min(mx0, mx1)
+    return min(xs) + x_shift, min(ys), max(xs) + x_shift, max(ys)
+
+
+def _iter_image_bboxes(page, form=None, matrix=None):
+    """
+    Yield the page-space bounding box of every image on a PDFium page, descending
+    into Form XObjects at any depth. PDFium reports a form's objects in the form's
+    own space, so each image's unit square is mapped through its matrix and those
+    of all enclosing forms.
+    """
+    matrix = matrix or pdfium.PdfMatrix()
+    for obj in page.get_objects(max_depth=1, form=form):
+        if obj.type == pdfium_c.FPDF_PAGEOBJ_FORM:
+            form_matrix = obj.get_matrix().multiply(matrix)
+            yield from _iter_image_bboxes(page, obj.raw, form_matrix)
+        elif obj.type == pdfium_c.FPDF_PAGEOBJ_IMAGE:
+            yield obj.get_matrix().multiply(matrix).on_rect(0, 0, 1, 1)
+
+
+def _extract_images_pypdfium2(pdf_path: Path) -> list[dict]:
+    """
+    Enumerate image objects with PDFium, without building pdfminer's layout tree.
+    Bounding boxes are converted to pdfplumber's coordinates, including for
+    images inside Form XObjects, rotated pages and MediaBoxes not anchored at
+    (0, 0); PDFium does not expose the XObject name or image type, so those are
+    left empty.
     """
     image_metadata = []
 
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for i, page in enumerate(pdf.pages):
-                if page.images:
-                    for img in page.images:
-                        img_info = {
-                            "page_number": i + 1,
-                            "x0": img["x0"],
-                            "y0": img["y0"],
-                            "x1": img["x1"],
-                            "y1": img["y1"],
-                            "width": img["width"],
-                            "height": img["height"],
-                            "name": img.get("name", ""),
-                            "imagetype": img.get("imagetype", "")
-                        }
-                        image_metadata.append(img_info)
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            for i, page in enumerate(pdf):
+                mediabox = page.get_mediabox()
+                rotation = page.get_rotation()
+                for bbox in _iter_image_bboxes(page):
+                    x0, y0, x1, y1 = _to_pdfplumber_bbox(bbox, mediabox, rotation)
+                    image_metadata.append({
+                        "page_number": i + 1,
+                        "x0": x0,
+                        "y0": y0,
+                        "x1": x1,
+                        "y1": y1,
+                        "width": x1 - x0,
+                        "height": y1 - y0,
+                        "name": "",
+                        "imagetype": ""
+                    })
+                page.close()
+        finally:
+            pdf.close()
     except Exception as e:
         logging.error(f"Error extracting image metadata from {pdf_path.name}: {e}")
 
     return image_metadata
 
 
-def extract_text_by_page(pdf_path: Path) -> list[dict]:
+def extract_image_metadata(pdf_or_path: Path | pdfplumber.PDF,
+                           config: ProcessingConfig = ProcessingConfig()) -> list[dict]:
+    """
+    Extract metadata about embedded images.
+    Returns list of image information dictionaries.
+    With `config.image_backend == "pypdfium2"`, images of a PDF path are enumerated
+    by PDFium, which is much cheaper when no other pdfplumber analysis is needed;
+    an already-open pdfplumber.PDF always uses its own parse.
+    """
+    is_open = isinstance(pdf_or_path, pdfplumber.PDF)
+    if config.image_backend == "pypdfium2" and not is_open:
+        return _extract_images_pypdfium2(Path(pdf_or_path))
+    return _cached_analysis_part(pdf_or_path, "images", config)
+
+
+def extract_text_by_page(pdf_or_path: Path | pdfplumber.PDF,
+                         config: ProcessingConfig = ProcessingConfig()) -> list[dict]:
     """
     Extract text with page numbers and metadata per page.
     Useful for fine-grained vectorization.
     """
-    pages_text = []
+    return _cached_analysis_part(pdf_or_path, "pages_text", config)
 
-    try:
-        with pdfplumber.open(pdf_path) as pdf:
-            for i, page in enumerate(pdf.pages):
-                text = page.extract_text() or ""
-                pages_text.append({
-                    "page_number": i + 1,
-                    "text": text,
-                    "word_count": len(text.split()),
-                    "has_images": len(page.images) > 0
-                })
-    except Exception as e:
-        logging.error(f"Error extracting text by page from {pdf_path.name}: {e}")
 
-    return pages_text
+def content_hasher():
+    """
+    Create the hash object used for content hashes (SHA-256).
+    OpenSSL's SHA-256 uses the SHA-NI instructions where available, which makes
+    it faster than MD5 on modern x86 CPUs.
+    """
+    return hashlib.sha256()
 
 
 def generate_content_hash(text: str) -> str:
     """
-    Generate an MD5 hash from input text for integrity tracking.
+    Generate a SHA-256 hash from input text for integrity tracking.
     """
-    return hashlib.md5(text.encode('utf-8')).hexdigest()
+    hasher = content_hasher()
+    hasher.update(text.encode('utf-8'))
+    return hasher.hexdigest()
@@ -1,17 +1,28 @@
 # pdf_processor.py — Extract Text and Metadata from PDFs
 
+import contextlib
 import os
 import re
 import json
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import islice
 import pdfplumber # Ensure this is in requirements.txt
+import pypdfium2 as pdfium
 from pathlib import Path
+from typing import Iterable, Iterator
 import logging # Consider using logging instead of print for better control
+try:
+    import orjson  # Optional: much faster JSON serialization
+except ImportError:
+    orjson = None
 from src.config.processing_config import ProcessingConfig
 from src.processing.content_analysis import (
-    analyze_page_content,
+    analyze_pdf,
+    content_hasher,
     extract_image_metadata,
-    extract_text_by_page,
-    generate_content_hash
+    open_pdf,
+    text_extraction_kwargs
 )
 
 
@@ -23,37 +34,98 @@ BASE_DIR = Path(__file__).resolve().parent.parent.parent # Get project root assu
 RAW_PDF_DIR = BASE_DIR / "data/raw/papers"
 TEXT_OUTPUT_DIR = BASE_DIR / "data/processed/papers/text"
 META_OUTPUT_DIR = BASE_DIR / "data/processed/papers/metadata"
+PAGES_OUTPUT_DIR = BASE_DIR / "data/processed/papers/pages"
+
+TEXT_BACKENDS = ("pdfplumber", "pypdfium2")
+
+# extract_title_heuristic() starts by looking at this many leading characters
+TITLE_SCAN_CHARS = 4096
+
+# Regex pattern based on the convention: [YYYY]_Author_Keyword(s).pdf
+# This version allows Author and Keyword to contain more than just \w (e.g., hyphens)
+# It captures everything after the second underscore as the keyword part.
+# Compiled once at import instead of on every call.
+_FILENAME_RE = re.compile(r"(\d{4})_([^_]+)_(.+)\.pdf")
+
+# Large write buffer so each output file is flushed in a handful of syscalls
+WRITE_BUFFER_SIZE = 1 << 16
 
 # Setup basic logging
-logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
 
 # --- Core Functions ---
 
-def extract_pdf_text(pdf_path: Path) -> str | None:
+
+def _iter_pages_pdfplumber(pdf_path: Path, config: ProcessingConfig,
+                           pdf: pdfplumber.PDF | None = None) -> Iterator[str]:
+    """
+    Yield per-page text with pdfplumber.
+    Reuses `pdf`, an already-open handle on `pdf_path`, when given.
+    """
+    text_kwargs = text_extraction_kwargs(config)
+    with open_pdf(pdf or pdf_path) as pdf:
+        for i, page in enumerate(pdf.pages):
+            # Extract text from each page (or empty string if None)
+            # Add basic progress logging per page if needed for long docs
+            # logging.debug(f"Extracting text from page {i+1}/{len(pdf.pages)} of {pdf_path.name}")
+            yield page.extract_text(**text_kwargs) or ""
+
+
+def _iter_pages_pypdfium2(pdf_path: Path) -> Iterator[str]:
+    """
+    Yield per-page text with PDFium, which skips pdfminer's layout analysis entirely.
+    PDFium separates lines with CRLF and replaces a hyphen at a line break with
+    \\x02; map both back to match the pdfplumber output.
+    """
+    pdf = pdfium.PdfDocument(pdf_path)
+    try:
+        for page in pdf:
+            textpage = page.get_textpage()
+            text = textpage.get_text_bounded()
+            text = text.replace("\r\n", "\n").replace("\x02", "-\n")
+            textpage.close()
+            page.close()
+            yield text
+    finally:
+        pdf.close()
+
+
+def _iter_page_texts(pdf_path: Path, config: ProcessingConfig,
+                     pdf: pdfplumber.PDF | None = None) -> Iterator[str]:
+    """
+    Return a lazy iterator over the text of each page, using `config.text_backend`.
+    The pdfplumber backend reuses `pdf`, an already-open handle on `pdf_path`,
+    when given.
+    """
+    if config.text_backend not in TEXT_BACKENDS:
+        raise ValueError(f"Unknown text backend: {config.text_backend!r}")
+    if config.text_backend == "pypdfium2":
+        return _iter_pages_pypdfium2(pdf_path)
+    return _iter_pages_pdfplumber(pdf_path, config, pdf)
+
+
+def extract_pdf_text(pdf_path: Path,
+                     config: ProcessingConfig = ProcessingConfig()) -> str | None:
     """
-    Extract all text from a PDF file using pdfplumber, page by page.
+    Extract all text from a PDF file, page by page, using the backend selected
+    by `config.text_backend` ("pypdfium2" by default, or "pdfplumber").
 
     Args:
         pdf_path (Path): Path to the PDF file.
+        config (ProcessingConfig): Selects the text backend and extraction settings.
 
     Returns:
         str | None: Joined string of all pages' text, or None if an error occurs.
     """
-    full_text = []
+    pages = _iter_page_texts(pdf_path, config)
     logging.info(f"Attempting to read {pdf_path.name}...")
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            if not pdf.pages:
-                logging.warning(f"No pages found in {pdf_path.name}")
-                return "" # Return empty string for empty PDFs
-
-            for i, page in enumerate(pdf.pages):
-                # Extract text from each page (or empty string if None)
-                # Add basic progress logging per page if needed for long docs
-                # logging.debug(f"Extracting text from page {i+1}/{len(pdf.pages)} of {pdf_path.name}")
-                text = page.extract_text() or ""
-                full_text.append(text)
-        
+        full_text = list(pages)
+        if not full_text:
+            logging.warning(f"No pages found in {pdf_path.name}")
+            return "" # Return empty string for empty PDFs
+
         logging.info(f"Successfully extracted text from {pdf_path.name}")
         return "\n".join(full_text)
     # Consider catching more specific pdfplumber exceptions if needed
@@ -61,6 +133,67 @@ def extract_pdf_text(pdf_path: Path) -> str | None:
         logging.error(f"Error reading {pdf_path.name}: {e}", exc_info=True) # Log traceback
         return None
 
+
+def extract_pdf_text_to_file(pdf_path: Path, out_path: Path,
+                             config: ProcessingConfig = ProcessingConfig(),
+                             pdf: pdfplumber.PDF | None = None,
+                             pages: Iterable[str] | None = None
+                             ) -> tuple[str, str | None] | None:
+    """
+    Extract all text from a PDF file and stream it to `out_path` page by page,
+    so only one page of text is held in memory at a time. The file contents are
+    identical to what extract_pdf_text() returns.
+
+    Each page is UTF-8 encoded once, and the bytes are both written and fed to
+    the content hash (when `config.generate_hash` is set), so the digest matches
+    generate_content_hash() of the full text. The text of the first page that
+    has any is kept too, because the title heuristic only looks at the opening
+    lines of the document.
+
+    Args:
+        pdf_path (Path): Path to the PDF file.
+        out_path (Path): Destination text file.
+        config (ProcessingConfig): Selects the text backend and extraction settings.
+        pdf (pdfplumber.PDF | None): Already-open handle on `pdf_path` to reuse with
+            the pdfplumber backend, so later pdfplumber steps share its parsed pages.
+        pages (Iterable[str] | None): Page texts that were already extracted (e.g. by
+            analyze_pdf()) to write instead of extracting them again.
+
+    Returns:
+        tuple[str, str | None] | None: Text of the first non-blank page ("" if there
+            is none) and the content hash (None unless requested), or None if an
+            error occurs (no partial file is left behind).
+    """
+    if pages is None:
+        pages = _iter_page_texts(pdf_path, config, pdf)
+    hasher = content_hasher() if config.generate_hash else None
+    logging.info(f"Attempting to read {pdf_path.name}...")
+    try:
+        page_count = 0
+        first_text = ""
+        with open(out_path, "wb", buffering=WRITE_BUFFER_SIZE) as out:
+            for page_count, text in enumerate(pages, start=1):
+                data = text.encode("utf-8")
+                if page_count > 1:
+                    out.write(b"\n")
+                    if hasher:
+                        hasher.update(b"\n")
+                out.write(data)
+                if hasher:
+                    hasher.update(data)
+                if not first_text and text.strip():
+                    first_text = text
+
+        if not page_count:
+            logging.warning(f"No pages found in {pdf_path.name}")
+        else:
+            logging.info(f"Successfully extracted text from {pdf_path.name}")
+        return first_text, hasher.hexdigest() if hasher else None
+    except Exception as e:
+        logging.error(f"Error reading {pdf_path.name}: {e}", exc_info=True) # Log traceback
+        out_path.unlink(missing_ok=True)
+        return None
+
 def extract_metadata_from_filename(filename: str) -> dict:
     """
     Extract year, first author, and keyword from the filename using regex.
@@ -72,11 +205,7 @@ def extract_metadata_from_filename(filename: str) -> dict:
     Returns:
         dict: Dictionary containing 'year', 'author', 'keyword'. Values are None if match fails.
     """
-    # Regex pattern based on the convention: [YYYY]_Author_Keyword(s).pdf
-    # This version allows Author and Keyword to contain more than just \w (e.g., hyphens)
-    # It captures everything after the second underscore as the keyword part.
-    pattern = r"(\d{4})_([^_]+)_(.+)\.pdf" 
-    match = re.match(pattern, filename)
+    match = _FILENAME_RE.match(filename)
     
     metadata = {
         "year": None,
@@ -103,7 +232,7 @@ def extract_title_heuristic(text: str, num_lines: int = 5) -> str | None:
     This is a simple heuristic and may not always be accurate.
 
     Args:
-        text (str): The full extracted text from the PDF.
+        text (str): Extracted text from the PDF; the first non-blank page is enough.
         num_lines (int): How many non-empty lines to check for a potential title.
 
     Returns:
@@ -111,104 +240,330 @@ def extract_title_heuristic(text: str, num_lines: int = 5) -> str | None:
     """
     if not text:
         return None
-        
-    lines = [line.strip() for line in text.strip().splitlines() if line.strip()]
-    
-    potential_title = None
-    if lines:
+
+    # The title sits at the top, so only split a prefix of the text, cut back to
+    # the last whole line. If the prefix runs out before the first `num_lines`
+    # non-empty lines are seen, retry with a prefix twice as long; the result is
+    # the same as scanning the whole text.
+    limit = TITLE_SCAN_CHARS
+    while True:
+        if len(text) > limit:
+            head = text[:text.rfind("\n", 0, limit) + 1]
+        else:
+            head = text
+
+        # Strip lines lazily and stop after the first `num_lines` non-empty ones
+        lines = (line.strip() for line in head.splitlines())
+
+        potential_title = None
+        lines_checked = 0
         # Often titles are short and in the first few lines.
         # This heuristic checks the first `num_lines` non-empty lines.
-        for i in range(min(num_lines, len(lines))):
-             # Simple check: assume title is relatively short and doesn't look like abstract/body
-             if len(lines[i]) < 150 and len(lines[i]) > 5: # Avoid grabbing very short/long lines
-                 potential_title = lines[i]
-                 break # Take the first plausible line
+        for line in islice(filter(None, lines), num_lines):
+            lines_checked += 1
+            # Simple check: assume title is relatively short and doesn't look like abstract/body
+            if len(line) < 150 and len(line) > 5:  # Avoid grabbing very short/long lines
+                potential_title = line
+                break # Take the first plausible line
+
+        if potential_title or lines_checked == num_lines or head is text:
+            break
+        limit *= 2
 
     logging.debug(f"Heuristic extracted title: '{potential_title}'")
     return potential_title
 
 
-def process_pdfs(config: ProcessingConfig = ProcessingConfig()):
+def _write_json(path: Path, obj, compact: bool = False) -> None:
     """
-    Process all PDF files in the raw papers directory:
-    - Extract text
-    - Save text to /data/processed/papers/text/
-    - Extract metadata (from filename and text heuristic)
-    - Save metadata as JSON to /data/processed/papers/metadata/
+    Serialize `obj` in one shot and write the UTF-8 bytes through a large buffer.
+    Uses orjson when it is installed, which is several times faster on metadata
+    carrying long page texts; otherwise falls back to json.dumps, whose C
+    encoder is used for compact output (json.dump always streams through the
+    pure-Python encoder in small fragments).
+
+    Args:
+        path (Path): Destination file.
+        obj: JSON-serializable object.
+        compact (bool): Drop indentation and whitespace for machine-read outputs.
     """
-    logging.info(f"Starting PDF processing in directory: {RAW_PDF_DIR}")
-    processed_count = 0
-    error_count = 0
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if not compact:
+            option |= orjson.OPT_INDENT_2
+        data = orjson.dumps(obj, option=option)
+    elif compact:
+        text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+        data = text.encode("utf-8")
+    else:
+        data = json.dumps(obj, ensure_ascii=False, indent=2).encode("utf-8")
+    with open(path, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+        f.write(data)
 
-    # Ensure output directories exist (redundant if main() ensures, but safe)
-    TEXT_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    META_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-    pdf_files = list(RAW_PDF_DIR.glob("*.pdf"))
-    if not pdf_files:
-        logging.warning(f"No PDF files found in {RAW_PDF_DIR}. Exiting.")
-        return
+def _write_pages_jsonl(path: Path, pages: list[dict]) -> None:
+    """
+    Write page-wise text as JSON Lines, one page object per line, so readers can
+    stream pages without loading the whole document.
 
-    logging.info(f"Found {len(pdf_files)} PDF files to process.")
+    Args:
+        path (Path): Destination .pages.jsonl file.
+        pages (list[dict]): Page entries as returned by analyze_pdf()["pages_text"].
+    """
+    with open(path, "wb", buffering=WRITE_BUFFER_SIZE) as f:
+        for page in pages:
+            if orjson is not None:
+                f.write(orjson.dumps(page))
+            else:
+                line = json.dumps(page, ensure_ascii=False, separators=(",", ":"))
+                f.write(line.encode("utf-8"))
+            f.write(b"\n")
+
+
+@contextlib.contextmanager
+def _shared_pdfplumber(pdf_file: Path, needed: bool):
+    """
+    Open one pdfplumber handle shared by all pdfplumber-based pipeline steps.
+    Yields None when no step needs it or the file can't be opened; each step then
+    opens the file itself and reports the error as usual.
+    """
+    if not needed:
+        yield None
+        return
+    try:
+        pdf = pdfplumber.open(pdf_file)
+    except Exception:
+        yield None
+        return
+    with pdf:
+        yield pdf
 
-    for pdf_file in pdf_files:
-        logging.info(f"--- Processing {pdf_file.name} ---")
 
-        # Configurable processing pipeline — toggle steps in ProcessingConfig
+def _run_pipeline(pdf_file: Path, config: ProcessingConfig) -> str | None:
+    """
+    Run the configured processing pipeline on a single PDF.
 
-        metadata = {}
+    Args:
+        pdf_file (Path): Path to the PDF file.
+        config (ProcessingConfig): Which processing steps to run.
 
-        # 1. Extract text
-        text = None
+    Returns:
+        str | None: None on success, or a short reason the PDF was skipped.
+    """
+    logging.info(f"--- Processing {pdf_file.name} ---")
+
+    # Configurable processing pipeline — toggle steps in ProcessingConfig
+
+    metadata = {}
+
+    # Content analysis, image metadata and page-wise text share one pdfplumber pass.
+    # With the pypdfium2 image backend, images are enumerated by PDFium instead, and the
+    # pdfplumber pass only runs if one of the other two steps needs it.
+    images_from_pdfium = config.extract_images and config.image_backend == "pypdfium2"
+    run_analysis = config.analyze_content or config.extract_text_by_page or (
+        config.extract_images and not images_from_pdfium)
+
+    # One pdfplumber handle feeds every pdfplumber-based step below, so the file is
+    # opened once and pages parsed by an earlier step are reused by later ones
+    needs_pdfplumber = run_analysis or (
+        config.extract_text and config.text_backend == "pdfplumber")
+    with _shared_pdfplumber(pdf_file, needs_pdfplumber) as pdf:
+        # The pdfplumber text backend extracts exactly the page texts the analysis pass
+        # does, so when both run, analyze first and write the text file from its pages
+        analysis = None
+        if run_analysis and config.extract_text and config.text_backend == "pdfplumber":
+            analysis = analyze_pdf(pdf or pdf_file, config)
+
+        # 1. Extract text, streamed straight to disk
+        has_text = False
+        first_text = ""
+        content_hash = None
         if config.extract_text:
-            text = extract_pdf_text(pdf_file)
-            if text is None:
-                logging.warning(f"Skipping {pdf_file.name} due to text extraction error.")
-                error_count += 1
-                continue
             text_filename = TEXT_OUTPUT_DIR / f"{pdf_file.stem}.txt"
-            text_filename.write_text(text, encoding="utf-8")
+            page_texts = None
+            # After a failed analysis, extract again so the error is reported as before
+            if analysis is not None and analysis["complete"]:
+                page_texts = (page["text"] for page in analysis["pages_text"])
+            extracted = extract_pdf_text_to_file(pdf_file, text_filename, config,
+                                                 pdf=pdf, pages=page_texts)
+            if extracted is None:
+                logging.warning(f"Skipping {pdf_file.name} due to text extraction error.")
+                return "text extraction error"
+            first_text, content_hash = extracted
             metadata["processed_text_path"] = str(text_filename.resolve())
+            has_text = text_filename.stat().st_size > 0
 
         # 2. Metadata from filename
         if config.extract_metadata:
             metadata.update(extract_metadata_from_filename(pdf_file.name))
 
-        # 3. Title heuristic
-        if config.extract_title and text:
-            metadata["extracted_title_heuristic"] = extract_title_heuristic(text)
+        # 3. Title heuristic; recorded as None when the text has no title, e.g. when
+        # every page is blank
+        if config.extract_title and has_text:
+            metadata["extracted_title_heuristic"] = extract_title_heuristic(first_text)
+
+        # 4-6. Single analysis pass over the shared handle
+        if run_analysis and analysis is None:
+            analysis = analyze_pdf(pdf or pdf_file, config)
 
         # 4. Page-level content analysis
         if config.analyze_content:
-            metadata["content_analysis"] = analyze_page_content(pdf_file)
+            metadata["content_analysis"] = analysis["content"]
 
         # 5. Extract image metadata
         if config.extract_images:
-            metadata["image_metadata"] = extract_image_metadata(pdf_file)
-            metadata["has_scanned_content"] = metadata["content_analysis"]["image_pages"] > 0
-
-        # 6. Text by page (for vector chunking)
+            if images_from_pdfium:
+                metadata["image_metadata"] = extract_image_metadata(pdf_file, config)
+            else:
+                metadata["image_metadata"] = analysis["images"]
+            # Scanned pages are image-only pages, which takes the text analysis to tell
+            if analysis is not None:
+                metadata["has_scanned_content"] = analysis["content"]["image_pages"] > 0
+
+        # 6. Text by page (for vector chunking), in a sidecar next to the metadata JSON
+        pages_error = None
         if config.extract_text_by_page:
-            metadata["pagewise_text"] = extract_text_by_page(pdf_file)
+            pages_filename = PAGES_OUTPUT_DIR / f"{pdf_file.stem}.pages.jsonl"
+            try:
+                _write_pages_jsonl(pages_filename, analysis["pages_text"])
+                metadata["pagewise_text_path"] = str(pages_filename.resolve())
+            except Exception as e:
+                # Don't point the metadata at a sidecar that wasn't written
+                pages_error = f"page-wise text write error: {e}"
+
+    # 7. Optional content hash
+    if config.generate_hash and has_text:
+        metadata["content_hash_sha256"] = content_hash
+
+    # 8. Save final metadata; a failed write, like a failed sidecar write, counts
+    # against this PDF
+    meta_filename = META_OUTPUT_DIR / f"{pdf_file.stem}.json"
+    meta_error = None
+    try:
+        _write_json(meta_filename, metadata, compact=config.compact_json)
+    except Exception as e:
+        meta_error = f"metadata write error: {e}"
+    error = "; ".join(filter(None, (meta_error, pages_error)))
+    if error:
+        logging.warning(f"Skipping {pdf_file.name} due to {error}.")
+        return error
+
+    logging.info(f"--- Finished processing {pdf_file.name} ---")
+    return None
+
+
+def _process_one_pdf(pdf_file: Path,
+                     config: ProcessingConfig) -> tuple[str, bool, str | None]:
+    """
+    Worker entry point: process one PDF without letting an unexpected error
+    abort the rest of the batch. Kept at module level so it can be pickled
+    into worker processes.
+
+    Args:
+        pdf_file (Path): Path to the PDF file.
+        config (ProcessingConfig): Which processing steps to run.
+
+    Returns:
+        tuple[str, bool, str | None]: The PDF filename, whether it was processed
+            successfully, and the error message if not.
+    """
+    try:
+        error = _run_pipeline(pdf_file, config)
+    except Exception as e:
+        logging.error(f"Error processing {pdf_file.name}: {e}", exc_info=True)
+        error = str(e)
+    return pdf_file.name, error is None, error
+
+
+def _init_worker() -> None:
+    """
+    Set up logging in each worker process. A no-op when the configuration was
+    inherited through fork, but needed under the spawn/forkserver start methods.
+    """
+    logging.basicConfig(level=logging.INFO, format=LOG_FORMAT)
+
 
-        # 7. Optional content hash
-        if config.generate_hash and text:
-            metadata["content_hash"] = generate_content_hash(text)
+def iter_pdfs(root: Path) -> Iterator[Path]:
+    """
+    Yield the PDF files directly inside `root` (case-insensitive ".pdf" extension).
+    os.scandir reuses the file type from the directory listing, so no per-file stat
+    call is needed.
+
+    Args:
+        root (Path): Directory to scan.
+
+    Yields:
+        Path: Path of each PDF file.
+    """
+    with os.scandir(root) as it:
+        for entry in it:
+            if entry.is_file() and entry.name.lower().endswith(".pdf"):
+                yield Path(entry.path)
+
+
+def process_pdfs(config: ProcessingConfig = ProcessingConfig()):
+    """
+    Process all PDF files in the raw papers directory:
+    - Extract text
+    - Save text to /data/processed/papers/text/
+    - Extract metadata (from filename and text heuristic)
+    - Save metadata as JSON to /data/processed/papers/metadata/
+    - Save page-wise text as JSON Lines to /data/processed/papers/pages/
+
+    Files are processed in parallel, `config.max_workers` worker processes
+    (one per CPU by default). If a worker process dies, the files it left
+    unfinished are reported as failures.
+    """
+    logging.info(f"Starting PDF processing in directory: {RAW_PDF_DIR}")
+    processed_count = 0
+    error_count = 0
 
-        # 8. Save final metadata
-        meta_filename = META_OUTPUT_DIR / f"{pdf_file.stem}.json"
-        with open(meta_filename, "w", encoding="utf-8") as f:
-            json.dump(metadata, f, indent=2, ensure_ascii=False)
+    # Ensure output directories exist (redundant if main() ensures, but safe)
+    TEXT_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    META_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
+    PAGES_OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
 
-        logging.info(f"--- Finished processing {pdf_file.name} ---")
-        processed_count += 1
+    if not RAW_PDF_DIR.is_dir():
+        logging.warning(f"No PDF files found in {RAW_PDF_DIR}. Exiting.")
+        return
 
+    # Sort so runs dispatch, log and report files in the same order regardless of
+    # directory listing order (a list of paths is cheap next to parsing them).
+    pdf_files = sorted(iter_pdfs(RAW_PDF_DIR))
+    if not pdf_files:
+        logging.warning(f"No PDF files found in {RAW_PDF_DIR}. Exiting.")
+        return
 
+    logging.info(f"Found {len(pdf_files)} PDF files to process.")
+
+    # Each PDF is independent and parsing is CPU-bound, so spread files across
+    # processes. PDFs vary widely in size, so hand them out one at a time to keep
+    # workers balanced.
+    failures = []
+    max_workers = config.max_workers or os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker) as ex:
+        futures = [ex.submit(_process_one_pdf, pdf_file, config)
+                   for pdf_file in pdf_files]
+        for pdf_file, future in zip(pdf_files, futures):
+            try:
+                name, ok, error = future.result()
+            except BrokenProcessPool:
+                # A worker died outright (e.g. a native crash in PDFium or the OOM
+                # killer); every file not finished by then fails, the rest still count
+                name, ok, error = pdf_file.name, False, "worker process crashed"
+                logging.error(f"Worker process crashed before finishing {name}")
+            if ok:
+                processed_count += 1
+            else:
+                error_count += 1
+                failures.append((name, error))
 
     logging.info(f"\n--- Processing Summary ---")
     logging.info(f"Total PDFs Found: {len(pdf_files)}")
     logging.info(f"Successfully Processed: {processed_count}")
     logging.info(f"Errors Encountered: {error_count}")
+    for name, error in failures:
+        logging.info(f"  {name}: {error}")
     logging.info(f"--------------------------")
 
 
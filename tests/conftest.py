@@ -0,0 +1,68 @@
+import pytest
+
+
+def _build_pdf(pages, mediabox=(0, 0, 612, 792), rotate=0, images=(), forms=()):
+    """
+    Build a minimal PDF with Helvetica text lines and 2x2 grayscale images.
+    `pages` is a list of pages, each a list of ASCII text lines; `images` holds
+    the `cm` matrices (a, b, c, d, e, f) of the images placed on every page.
+    `forms` holds the `cm` matrices of nested Form XObjects: each form draws the
+    next, the innermost draws the images, and the pages draw the outermost.
+    """
+    objs = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page objects are numbered
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+        b"<< /Type /XObject /Subtype /Image /Width 2 /Height 2 /ColorSpace /DeviceGray"
+        b" /BitsPerComponent 8 /Length 4 >>\nstream\n\x00\xff\xff\x00\nendstream",
+    ]
+    draw = [f"q {' '.join(str(v) for v in cm)} cm /Im0 Do Q" for cm in images]
+    xobjects = "/Im0 4 0 R"
+    for cm in reversed(forms):
+        body = " ".join(draw).encode("ascii")
+        objs.append(
+            b"<< /Type /XObject /Subtype /Form /BBox [-5000 -5000 5000 5000]"
+            b" /Resources << /XObject << %s >> >> /Length %d >>\nstream\n%s\nendstream"
+            % (xobjects.encode("ascii"), len(body), body))
+        xobjects = f"/Im0 4 0 R /Fm0 {len(objs)} 0 R"
+        draw = [f"q {' '.join(str(v) for v in cm)} cm /Fm0 Do Q"]
+    box = " ".join(str(v) for v in mediabox)
+    kids = []
+    for lines in pages:
+        ops = ["BT /F1 12 Tf 72 720 Td"]
+        ops += [f"({line}) Tj 0 -16 Td" for line in lines]
+        ops.append("ET")
+        ops += draw
+        stream = " ".join(ops).encode("ascii")
+        objs.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        objs.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [{box}] /Rotate {rotate}"
+            f" /Resources << /Font << /F1 3 0 R >> /XObject << {xobjects} >> >>"
+            f" /Contents {len(objs)} 0 R >>".encode("ascii"))
+        kids.append(f"{len(objs)} 0 R")
+    objs[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode()
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for num, body in enumerate(objs, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (num, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objs) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objs) + 1, xref)
+    return bytes(out)
+
+
+@pytest.fixture
+def make_pdf(tmp_path):
+    """
+    Factory fixture: make_pdf(name, pages, **kwargs) writes a generated PDF
+    (see _build_pdf) into the test's temporary directory and returns its path.
+    """
+    def make(name, pages, **kwargs):
+        path = tmp_path / name
+        path.write_bytes(_build_pdf(pages, **kwargs))
+        return path
+    return make
@@ -0,0 +1,96 @@
+import os
+
+import pytest
+
+from src.config.processing_config import ProcessingConfig
+from src.processing.content_analysis import (
+    _analyze_pdf_cached,
+    extract_image_metadata,
+    extract_text_by_page
+)
+
+BBOX_KEYS = ("x0", "y0", "x1", "y1", "width", "height")
+
+
+@pytest.mark.parametrize("mediabox", [
+    (0, 0, 612, 792),
+    (100, 100, 712, 892),
+    (-50, 20, 400, 500),
+    (612, 792, 0, 0),
+])
+@pytest.mark.parametrize("rotate", [0, 90, 180, 270, -90])
+@pytest.mark.parametrize("forms", [
+    (),
+    # Images drawn inside a translated Form XObject
+    [(1, 0, 0, 1, 200, 300)],
+    # Two nested forms, the inner one scaled
+    [(1, 0, 0, 1, 200, 300), (0.5, 0, 0, 0.5, 10, 10)],
+    # A form that rotates its content by 90 degrees
+    [(0, 1, -1, 0, 400, 100)],
+])
+def test_pypdfium2_image_boxes_match_pdfplumber(make_pdf, mediabox, rotate, forms):
+    pdf = make_pdf("figures.pdf", [["Figure page"]], mediabox=mediabox,
+                   rotate=rotate, forms=forms,
+                   images=[(100, 0, 0, 50, 300, 200), (30, 0, 0, 20, 150, 400)])
+
+    expected = extract_image_metadata(pdf, ProcessingConfig(image_backend="pdfplumber"))
+    got = extract_image_metadata(pdf, ProcessingConfig(image_backend="pypdfium2"))
+
+    assert len(got) == len(expected) == 2
+    for image, reference in zip(got, expected):
+        assert image["page_number"] == reference["page_number"]
+        for key in BBOX_KEYS:
+            assert image[key] == pytest.approx(reference[key]), key
+
+
+@pytest.fixture
+def analysis_cache():
+    """
+    Start and end the test with an empty analysis cache; yields its cache_info.
+    """
+    _analyze_pdf_cached.cache_clear()
+    yield _analyze_pdf_cached.cache_info
+    _analyze_pdf_cached.cache_clear()
+
+
+def test_str_path_is_analyzed_like_a_path(make_pdf, analysis_cache):
+    pdf = make_pdf("paper.pdf", [["First page"], ["Second page"]])
+
+    assert extract_text_by_page(str(pdf)) == extract_text_by_page(pdf)
+    assert analysis_cache().misses == 1
+
+
+def test_second_call_is_served_from_the_cache(make_pdf, analysis_cache):
+    pdf = make_pdf("paper.pdf", [["First page"], ["Second page"]])
+
+    first = extract_text_by_page(pdf)
+    first[0]["text"] = "changed by the caller"
+    second = extract_text_by_page(pdf)
+
+    assert (analysis_cache().hits, analysis_cache().misses) == (1, 1)
+    # Each call gets its own copy of the cached result
+    assert second[0]["text"] == "First page"
+
+
+def test_changed_file_is_parsed_again(make_pdf, analysis_cache):
+    pdf = make_pdf("paper.pdf", [["First page"]])
+    stat = pdf.stat()
+    assert extract_text_by_page(pdf)[0]["text"] == "First page"
+
+    make_pdf("paper.pdf", [["Rewritten first page"]])
+    # Same mtime, as on a filesystem with coarse timestamps: the size tells them apart
+    os.utime(pdf, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    assert extract_text_by_page(pdf)[0]["text"] == "Rewritten first page"
+    assert analysis_cache().misses == 2
+
+
+def test_failed_analysis_is_not_memoized(make_pdf, tmp_path, analysis_cache):
+    pdf = tmp_path / "paper.pdf"
+    pdf.write_bytes(b"not a pdf yet")
+
+    assert extract_text_by_page(pdf) == []
+    assert analysis_cache().currsize == 0
+
+    make_pdf("paper.pdf", [["First page"]])
+    assert extract_text_by_page(pdf)[0]["text"] == "First page"
@@ -0,0 +1,256 @@
+import json
+import os
+
+import pytest
+
+import src.processing.pdf_processor as pdf_processor
+from src.config.processing_config import ProcessingConfig
+from src.processing.content_analysis import extract_text_by_page, generate_content_hash
+from src.processing.pdf_processor import (
+    TITLE_SCAN_CHARS,
+    extract_pdf_text,
+    extract_pdf_text_to_file,
+    extract_title_heuristic,
+    iter_pdfs
+)
+
+PAGES = [
+    ["A Study of Test Documents", "Jane Doe and John Roe", "Abstract text here."],
+    ["Second page heading", "More body text on page two."],
+    [],
+    ["Last page", "Closing remarks."],
+]
+
+
+@pytest.fixture
+def output_dirs(tmp_path, monkeypatch):
+    """
+    Point the pipeline's output directories at the test's temporary directory.
+    """
+    dirs = {}
+    for name in ("TEXT_OUTPUT_DIR", "META_OUTPUT_DIR", "PAGES_OUTPUT_DIR"):
+        dirs[name] = tmp_path / name.lower()
+        dirs[name].mkdir()
+        monkeypatch.setattr(pdf_processor, name, dirs[name])
+    return dirs
+
+
+def _process(pdf, config, output_dirs):
+    """
+    Run the pipeline on one PDF; return its result tuple and the metadata JSON.
+    """
+    result = pdf_processor._process_one_pdf(pdf, config)
+    meta_file = output_dirs["META_OUTPUT_DIR"] / f"{pdf.stem}.json"
+    metadata = json.loads(meta_file.read_text()) if meta_file.is_file() else None
+    return result, metadata
+
+
+def _crash_on_b(pdf_file, config):
+    """
+    Stand-in for _process_one_pdf whose worker process dies outright on b.pdf.
+    """
+    if pdf_file.name == "b.pdf":
+        os._exit(1)
+    return pdf_file.name, True, None
+
+
+def _fail_all(pdf_file, config):
+    """
+    Stand-in for _process_one_pdf that fails every file without parsing it.
+    """
+    return pdf_file.name, False, "stub failure"
+
+
+@pytest.mark.parametrize("backend", ["pdfplumber", "pypdfium2"])
+def test_streamed_text_file_matches_extract_pdf_text(make_pdf, tmp_path, backend):
+    pdf = make_pdf("paper.pdf", PAGES)
+    config = ProcessingConfig(text_backend=backend)
+    out = tmp_path / "paper.txt"
+
+    first_text, _ = extract_pdf_text_to_file(pdf, out, config)
+
+    assert out.read_bytes() == extract_pdf_text(pdf, config).encode("utf-8")
+    assert first_text.startswith("A Study of Test Documents")
+
+
+def test_streamed_text_file_removed_on_error(tmp_path):
+    bad = tmp_path / "broken.pdf"
+    bad.write_bytes(b"not a pdf")
+    out = tmp_path / "broken.txt"
+
+    assert extract_pdf_text_to_file(bad, out) is None
+    assert not out.exists()
+
+
+@pytest.mark.parametrize("backend", ["pdfplumber", "pypdfium2"])
+def test_streamed_hash_matches_generate_content_hash(make_pdf, tmp_path, backend):
+    pdf = make_pdf("paper.pdf", PAGES)
+    config = ProcessingConfig(text_backend=backend)
+
+    _, content_hash = extract_pdf_text_to_file(pdf, tmp_path / "paper.txt", config)
+
+    assert content_hash == generate_content_hash(extract_pdf_text(pdf, config))
+
+
+@pytest.mark.parametrize("backend", ["pdfplumber", "pypdfium2"])
+def test_metadata_records_sha256_content_hash(make_pdf, output_dirs, backend):
+    pdf = make_pdf("2024_Doe_Testing.pdf", PAGES)
+    config = ProcessingConfig(text_backend=backend)
+
+    result, metadata = _process(pdf, config, output_dirs)
+
+    assert result == ("2024_Doe_Testing.pdf", True, None)
+    assert "content_hash" not in metadata
+    text_file = output_dirs["TEXT_OUTPUT_DIR"] / "2024_Doe_Testing.txt"
+    text = text_file.read_bytes().decode("utf-8")
+    assert metadata["content_hash_sha256"] == generate_content_hash(text)
+
+
+def test_text_backends_write_identical_files(make_pdf, tmp_path):
+    """
+    On simple single-column text both backends produce the same file, with
+    PDFium's CRLF line breaks normalized to LF and its hyphenation marker mapped
+    back to a hyphen and line break. They can still differ where pdfminer's
+    layout analysis and PDFium disagree (multi-column layouts, ligatures,
+    spacing inferred from glyph gaps).
+    """
+    pdf = make_pdf("paper.pdf", PAGES + [["This is an exam-", "ple of hyphen"]])
+    outputs = {}
+    for backend in ("pdfplumber", "pypdfium2"):
+        out = tmp_path / f"{backend}.txt"
+        extract_pdf_text_to_file(pdf, out, ProcessingConfig(text_backend=backend))
+        outputs[backend] = out.read_bytes()
+
+    assert outputs["pypdfium2"] == outputs["pdfplumber"]
+    assert b"\r" not in outputs["pypdfium2"]
+    assert b"exam-\nple" in outputs["pypdfium2"]
+
+
+def test_default_text_backend_is_pypdfium2():
+    assert ProcessingConfig().text_backend == "pypdfium2"
+
+
+def test_unknown_text_backend_is_rejected(make_pdf):
+    pdf = make_pdf("paper.pdf", PAGES)
+
+    with pytest.raises(ValueError, match="Unknown text backend"):
+        extract_pdf_text(pdf, ProcessingConfig(text_backend="pymupdf"))
+
+
+def test_pagewise_text_sidecar_round_trips(make_pdf, output_dirs):
+    pdf = make_pdf("2024_Doe_Testing.pdf", PAGES, images=[(100, 0, 0, 50, 72, 400)])
+
+    result, metadata = _process(pdf, ProcessingConfig(), output_dirs)
+
+    assert result == ("2024_Doe_Testing.pdf", True, None)
+    assert "pagewise_text" not in metadata
+    sidecar = output_dirs["PAGES_OUTPUT_DIR"] / "2024_Doe_Testing.pages.jsonl"
+    assert metadata["pagewise_text_path"] == str(sidecar.resolve())
+    lines = sidecar.read_text(encoding="utf-8").splitlines()
+    pages = [json.loads(line) for line in lines]
+    # Same entries the metadata JSON used to embed under "pagewise_text"
+    assert pages == extract_text_by_page(pdf)
+    assert [page["page_number"] for page in pages] == [1, 2, 3, 4]
+    assert all(page["has_images"] for page in pages)
+
+
+@pytest.mark.parametrize("backend", ["pdfplumber", "pypdfium2"])
+def test_blank_pages_record_no_title(make_pdf, output_dirs, backend):
+    pdf = make_pdf("2024_Doe_Blank.pdf", [[], []])
+
+    result, metadata = _process(pdf, ProcessingConfig(text_backend=backend),
+                                output_dirs)
+
+    assert result == ("2024_Doe_Blank.pdf", True, None)
+    assert metadata["extracted_title_heuristic"] is None
+
+
+def test_failed_sidecar_write_fails_the_pdf(make_pdf, output_dirs):
+    pdf = make_pdf("2024_Doe_Testing.pdf", PAGES)
+    # A directory in the sidecar's place makes its write fail
+    (output_dirs["PAGES_OUTPUT_DIR"] / "2024_Doe_Testing.pages.jsonl").mkdir()
+
+    (name, ok, error), metadata = _process(pdf, ProcessingConfig(), output_dirs)
+
+    assert not ok
+    assert error.startswith("page-wise text write error")
+    assert "pagewise_text_path" not in metadata
+
+
+def test_failed_metadata_write_fails_the_pdf(make_pdf, output_dirs, caplog):
+    pdf = make_pdf("2024_Doe_Testing.pdf", PAGES)
+    (output_dirs["META_OUTPUT_DIR"] / "2024_Doe_Testing.json").mkdir()
+
+    (name, ok, error), metadata = _process(pdf, ProcessingConfig(), output_dirs)
+
+    assert (name, ok) == ("2024_Doe_Testing.pdf", False)
+    assert error.startswith("metadata write error")
+    # Reported once, as the reason the PDF was skipped
+    assert [r.levelname for r in caplog.records if "write error" in r.message] == [
+        "WARNING"]
+
+
+def test_worker_crash_reports_unfinished_files(tmp_path, output_dirs, monkeypatch,
+                                               caplog):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    for name in ("a.pdf", "b.pdf", "c.pdf"):
+        (raw / name).write_bytes(b"")
+    monkeypatch.setattr(pdf_processor, "RAW_PDF_DIR", raw)
+    monkeypatch.setattr(pdf_processor, "_process_one_pdf", _crash_on_b)
+    caplog.set_level("INFO")
+
+    pdf_processor.process_pdfs(ProcessingConfig(max_workers=1))
+
+    messages = [r.getMessage() for r in caplog.records]
+    assert "Successfully Processed: 1" in messages
+    assert "Errors Encountered: 2" in messages
+    assert "  b.pdf: worker process crashed" in messages
+    assert "  c.pdf: worker process crashed" in messages
+
+
+def test_iter_pdfs_finds_pdf_files_only(tmp_path):
+    for name in ("b.pdf", "A.PDF", "c.Pdf", "notes.txt", "pdf"):
+        (tmp_path / name).write_bytes(b"")
+    # Directories are skipped even when named like a PDF
+    (tmp_path / "folder.pdf").mkdir()
+    (tmp_path / "folder.pdf" / "nested.pdf").write_bytes(b"")
+
+    names = sorted(path.name for path in iter_pdfs(tmp_path))
+
+    assert names == ["A.PDF", "b.pdf", "c.Pdf"]
+
+
+def test_process_pdfs_handles_files_in_sorted_order(tmp_path, output_dirs,
+                                                    monkeypatch, caplog):
+    raw = tmp_path / "raw"
+    raw.mkdir()
+    for name in ("c.pdf", "a.pdf", "B.pdf", "b.pdf"):
+        (raw / name).write_bytes(b"")
+    monkeypatch.setattr(pdf_processor, "RAW_PDF_DIR", raw)
+    monkeypatch.setattr(pdf_processor, "_process_one_pdf", _fail_all)
+    caplog.set_level("INFO")
+
+    pdf_processor.process_pdfs(ProcessingConfig(max_workers=2))
+
+    reported = [r.getMessage() for r in caplog.records
+                if r.getMessage().endswith(": stub failure")]
+    assert reported == [f"  {name}: stub failure"
+                        for name in ("B.pdf", "a.pdf", "b.pdf", "c.pdf")]
+
+
+@pytest.mark.parametrize("text, title", [
+    # Title well inside the scanned prefix of a long page
+    ("\n\nA Study of Test Documents\n" + "body text " * 2000,
+     "A Study of Test Documents"),
+    # First plausible line straddles TITLE_SCAN_CHARS: found whole, not cut short
+    ("x" * (TITLE_SCAN_CHARS - 10) + "\nStraddling title line\nbody",
+     "Straddling title line"),
+    # A single line longer than the prefix, followed by a title
+    ("H" * (3 * TITLE_SCAN_CHARS) + "\nTitle After Long Line", "Title After Long Line"),
+    # Title past the first five non-empty lines is not considered
+    ("\n".join(["L" * 1500] * 5 + ["Too Late For A Title"]), None),
+])
+def test_title_heuristic_unaffected_by_scan_limit(text, title):
+    assert len(text) > TITLE_SCAN_CHARS
+    assert extract_title_heuristic(text) == title